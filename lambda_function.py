@@ -1,34 +1,88 @@
-import json
 import os
+import time
+import uuid
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from datetime import date, datetime, timedelta
-from typing import Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
-import boto3
-import requests
+import orjson
 from aws_lambda_powertools import Logger
-from boto3.dynamodb.types import TypeDeserializer
 
 logger = Logger()
 
 COST_METRICS_VALUE = os.getenv("COST_METRICS_VALUE")
 LINE_API_URL = os.getenv("LINE_API_URL")
 SETTINGS_TABLE = os.getenv("SETTINGS_TABLE")
+LINE_CHANNEL_ID_PARAMETER = os.getenv("LINE_CHANNEL_ID_PARAMETER")
+LINE_ACCESS_TOKEN_PARAMETER = os.getenv("LINE_ACCESS_TOKEN_PARAMETER")
+
+MESSAGE_TEMPLATE = '{start}～{end}の請求額は、{total:.3f} USDです。'
+
+# 認証情報はほとんど変わらないため、ウォーム起動時は一定時間キャッシュを使う
+CREDENTIALS_CACHE_TTL = 600
+_CREDENTIALS_CACHE: Dict[str, Tuple[float, "LineCredentials"]] = {}
+
+# BatchGetItem の UnprocessedKeys を再取得するまでの待機秒数
+UNPROCESSED_KEYS_RETRY_DELAY = 0.1
+
+# 通知は 1 日 1 回程度のため、同じ集計期間の請求額は一定時間キャッシュを使う
+BILLING_CACHE_TTL = 600
+_LAST_BILLING: Optional[Tuple[Tuple[str, str, str], float, "BillingInfo"]] = None
+
+
+# ========================
+# Lazy Dependencies
+# ========================
+# boto3 / requests はコールドスタート時の import コストが大きいため、
+# 初回利用時に読み込みコンテナ内で使い回す
+@lru_cache(maxsize=None)
+def _get_session():
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    # LINE への POST は X-Line-Retry-Key で冪等になるため、429/5xx でも再試行する
+    session.mount('https://', HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=4,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({'POST'}),
+            raise_on_status=False
+        )
+    ))
+    return session
+
+
+@lru_cache(maxsize=None)
+def _get_client(service_name: str, region_name: Optional[str] = None):
+    import boto3
+    from botocore.config import Config
+
+    # スロットリングは botocore 側で待機・再試行し、タイムアウトはデフォルトの 60 秒から短縮する
+    config = Config(
+        retries={'max_attempts': 5, 'mode': 'adaptive'},
+        connect_timeout=3,
+        read_timeout=10
+    )
+    return boto3.client(service_name, region_name=region_name, config=config)
 
 
 # ========================
 # Data Models
 # ========================
-@dataclass
-class BillingInfo:
+class BillingInfo(NamedTuple):
     start: str
     end: str
     amount: float
 
 
-@dataclass
-class LineCredentials:
+class LineCredentials(NamedTuple):
     channel_id: str
     access_token: str
 
@@ -75,14 +129,13 @@ class DateHelper:
     
     @staticmethod
     def get_date_range() -> Tuple[str, str]:
-        start_date = DateHelper.get_begin_of_month()
-        end_date = DateHelper.get_today()
+        today = date.today()
 
-        if start_date == end_date:
-            end_of_month = datetime.strptime(start_date, '%Y-%m-%d') + timedelta(days=-1)
-            begin_of_month = end_of_month.replace(day=1)
-            return begin_of_month.date().isoformat(), end_date
-        return start_date, end_date
+        # 月初は前月分を集計する
+        if today.day == 1:
+            begin_of_month = (today - timedelta(days=1)).replace(day=1)
+            return begin_of_month.isoformat(), today.isoformat()
+        return today.replace(day=1).isoformat(), today.isoformat()
 
 
 # ========================
@@ -91,13 +144,23 @@ class DateHelper:
 class AwsCostCalculator(CostCalculatorBase):
     
     def __init__(self, region: str = 'us-east-1'):
-        self.client = boto3.client('ce', region_name=region)
+        self.client = _get_client('ce', region)
         self.metrics_value = COST_METRICS_VALUE
     
     def get_billing_info(self) -> Optional[BillingInfo]:
+        global _LAST_BILLING
+        from botocore.exceptions import BotoCoreError, ClientError
+
         try:
             start_date, end_date = DateHelper.get_date_range()
+
+            cache_key = (start_date, end_date, self.metrics_value)
+            if _LAST_BILLING:
+                last_key, fetched_at, last_billing_info = _LAST_BILLING
+                if last_key == cache_key and time.monotonic() - fetched_at < BILLING_CACHE_TTL:
+                    return last_billing_info
             
+            # GroupBy は指定せず、合計値のみを 1 期間分取得する
             response = self.client.get_cost_and_usage(
                 TimePeriod={'Start': start_date, 'End': end_date},
                 Granularity='MONTHLY',
@@ -105,12 +168,17 @@ class AwsCostCalculator(CostCalculatorBase):
             )
             
             result = response.get('ResultsByTime')[0]
-            return BillingInfo(
+            billing_info = BillingInfo(
                 start=result['TimePeriod']['Start'],
                 end=result['TimePeriod']['End'],
                 amount=float(result['Total'][self.metrics_value]['Amount'])
             )
-        except Exception as e:
+            _LAST_BILLING = (cache_key, time.monotonic(), billing_info)
+            return billing_info
+        except (ClientError, BotoCoreError) as e:
+            logger.error("Failed to get cost and usage: %s", e)
+            return None
+        except (KeyError, IndexError, ValueError) as e:
             logger.exception(e)
             return None
 
@@ -119,38 +187,93 @@ class DynamoDbTokenRepository(TokenRepositoryBase):
 
     def __init__(self, table_name: str):
         self.table_name = table_name
-        self.client = boto3.client('dynamodb')
-        self.deserializer = TypeDeserializer()
+        self.client = _get_client('dynamodb')
 
     def get_credentials(self) -> Optional[LineCredentials]:
+        cached = _CREDENTIALS_CACHE.get(self.table_name)
+        if cached and time.monotonic() - cached[0] < CREDENTIALS_CACHE_TTL:
+            return cached[1]
+
+        from botocore.exceptions import BotoCoreError, ClientError
+
         try:
-            channel_id = self._get_value('line_channel_id')
-            access_token = self._get_value('line_access_token')
+            values = self._get_values(['line_channel_id', 'line_access_token'])
+            channel_id = values.get('line_channel_id')
+            access_token = values.get('line_access_token')
             
             if channel_id and access_token:
-                return LineCredentials(
+                credentials = LineCredentials(
                     channel_id=channel_id,
                     access_token=access_token
                 )
+                _CREDENTIALS_CACHE[self.table_name] = (time.monotonic(), credentials)
+                return credentials
             return None
-        except Exception as e:
-            logger.exception(e)
+        except (ClientError, BotoCoreError) as e:
+            logger.error("Failed to get credentials from DynamoDB: %s", e)
+            return None
+        except KeyError as e:
+            logger.error("Unexpected credential item format: missing %s", e)
             return None
     
-    def _get_value(self, key: str) -> Optional[str]:
+    def _get_values(self, keys: List[str]) -> Dict[str, str]:
+        request_items = {
+            self.table_name: {'Keys': [{'type': {'S': key}} for key in keys]}
+        }
+        values = {}
+        # UnprocessedKeys が返った場合は少し待ってから一度だけ再取得する
+        for attempt in range(2):
+            if attempt:
+                time.sleep(UNPROCESSED_KEYS_RETRY_DELAY)
+            response = self.client.batch_get_item(RequestItems=request_items)
+            # 設定値はすべて文字列型 ({'S': str}) で保存されている
+            for item in response['Responses'].get(self.table_name, []):
+                values[item['type']['S']] = item['value']['S']
+
+            request_items = response.get('UnprocessedKeys')
+            if not request_items:
+                break
+        return values
+
+
+class SsmTokenRepository(TokenRepositoryBase):
+
+    def __init__(
+        self,
+        channel_id_name: str,
+        access_token_name: str,
+        max_age: int = 900
+    ):
+        from aws_lambda_powertools.utilities.parameters import SSMProvider
+
+        self.channel_id_name = channel_id_name
+        self.access_token_name = access_token_name
+        self.max_age = max_age
+        # 他の AWS クライアントと同じ再試行・タイムアウト設定を使う
+        self.provider = SSMProvider(boto3_client=_get_client('ssm'))
+
+    def get_credentials(self) -> Optional[LineCredentials]:
+        # Powertools がコンテナ内で max_age 秒間キャッシュする
+        from aws_lambda_powertools.utilities.parameters import GetParameterError
+        from botocore.exceptions import BotoCoreError, ClientError
+
         try:
-            response = self.client.get_item(
-                TableName=self.table_name,
-                Key={'type': {'S': key}}
+            values = self.provider.get_parameters_by_name(
+                parameters={self.channel_id_name: {}, self.access_token_name: {}},
+                decrypt=True,
+                max_age=self.max_age
             )
-            
-            item = {
-                k: self.deserializer.deserialize(v)
-                for k, v in response['Item'].items()
-            }
-            return item.get('value')
-        except Exception as e:
-            logger.exception(e)
+            channel_id = values.get(self.channel_id_name)
+            access_token = values.get(self.access_token_name)
+
+            if channel_id and access_token:
+                return LineCredentials(
+                    channel_id=channel_id,
+                    access_token=access_token
+                )
+            return None
+        except (GetParameterError, ClientError, BotoCoreError) as e:
+            logger.error("Failed to get credentials from Parameter Store: %s", e)
             return None
 
 
@@ -158,14 +281,17 @@ class BillingMessageFormatter(MessageFormatterBase):
     
     def format(self, billing_info: BillingInfo) -> str:
         try:
-            start = datetime.strptime(billing_info.start, '%Y-%m-%d').strftime('%m/%d')
-            end_today = datetime.strptime(billing_info.end, '%Y-%m-%d')
+            start = date.fromisoformat(billing_info.start).strftime('%m/%d')
+            end_today = date.fromisoformat(billing_info.end)
             end_yesterday = (end_today - timedelta(days=1)).strftime('%m/%d')
             
-            total = round(billing_info.amount, 3)
-            return f'{start}～{end_yesterday}の請求額は、{total:.3f} USDです。'
-        except Exception as e:
-            logger.exception(e)
+            return MESSAGE_TEMPLATE.format_map({
+                'start': start,
+                'end': end_yesterday,
+                'total': billing_info.amount
+            })
+        except ValueError as e:
+            logger.error("Invalid billing period: %s", e)
             return ""
 
 
@@ -174,28 +300,42 @@ class LineNotifier(NotifierBase):
     def __init__(self, credentials: LineCredentials, api_url: str = LINE_API_URL):
         self.api_url = api_url
         self.credentials = credentials
+        self._headers = {
+            "Authorization": f"Bearer {credentials.access_token}",
+            "Content-Type": "application/json"
+        }
     
     def send(self, message: str) -> bool:
+        import requests
+
         try:
-            headers = {
-                "Authorization": f"Bearer {self.credentials.access_token}",
-                "Content-Type": "application/json"
-            }
-            data = {
+            body = orjson.dumps({
                 "to": self.credentials.channel_id,
                 "messages": [{"type": "text", "text": message}]
-            }
+            })
+            
+            # 再試行時も同じキーが送られ、LINE 側で重複配信が防がれる
+            headers = {**self._headers, "X-Line-Retry-Key": str(uuid.uuid4())}
             
-            response = requests.post(
+            response = _get_session().post(
                 self.api_url,
                 headers=headers,
                 timeout=10,
-                data=json.dumps(data)
+                data=body
             )
-            logger.info(f'response: {response.json()}')
-            return response.status_code == 200
+            if response.status_code == 200:
+                return True
+            # 409 は同じリトライキーのリクエストが既に受理済みであることを示す
+            if response.status_code == 409 and 'X-Line-Accepted-Request-Id' in response.headers:
+                return True
+            logger.error(
+                "LINE API failed: status=%d body=%s",
+                response.status_code,
+                response.text[:500]
+            )
+            return False
         except requests.exceptions.RequestException as e:
-            logger.exception(e)
+            logger.error("LINE API request failed: %s", e)
             return False
 
 
@@ -215,38 +355,79 @@ class CostNotificationService:
         self.message_formatter = message_formatter
     
     def notify(self) -> bool:
-        billing_info = self.cost_calculator.get_billing_info()
+        # Cost Explorer と DynamoDB の呼び出しは独立しているため並行して実行する
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            billing_future = executor.submit(self.cost_calculator.get_billing_info)
+            credentials_future = executor.submit(self.token_repository.get_credentials)
+            billing_info = billing_future.result()
+            credentials = credentials_future.result()
+
+        # ログは呼び出しごとに 1 レコードにまとめて出力する
+        fields = {}
         if not billing_info:
             logger.error("Failed to get billing info")
             return False
-        logger.info(f'billing_info: {billing_info}')
+        fields['billing_info'] = billing_info._asdict()
         
         message = self.message_formatter.format(billing_info)
         if not message:
-            logger.error("Failed to format message")
+            logger.error("Failed to format message", extra=fields)
             return False
-        logger.info(f'message: {message}')
+        fields['notification_message'] = message
 
-        credentials = self.token_repository.get_credentials()
         if not credentials:
-            logger.error("Failed to get credentials")
+            logger.error("Failed to get credentials", extra=fields)
             return False
         
         notifier = LineNotifier(credentials)
         success = notifier.send(message)
-        logger.info(f'notification success: {success}')
+        fields['notification_success'] = success
+        if success:
+            logger.info("notify", extra=fields)
+        else:
+            logger.error("notify", extra=fields)
         return success
 
 
 # ========================
 # Lambda Handler
 # ========================
-def lambda_handler(event, context) -> None:
-    service = CostNotificationService(
+def _get_token_repository() -> TokenRepositoryBase:
+    # パラメータ名が設定されていれば Parameter Store から取得する
+    if LINE_CHANNEL_ID_PARAMETER and LINE_ACCESS_TOKEN_PARAMETER:
+        return SsmTokenRepository(LINE_CHANNEL_ID_PARAMETER, LINE_ACCESS_TOKEN_PARAMETER)
+    return DynamoDbTokenRepository(SETTINGS_TABLE)
+
+
+@lru_cache(maxsize=None)
+def _get_service() -> CostNotificationService:
+    return CostNotificationService(
         cost_calculator=AwsCostCalculator(),
-        token_repository=DynamoDbTokenRepository(SETTINGS_TABLE),
+        token_repository=_get_token_repository(),
         message_formatter=BillingMessageFormatter()
     )
 
+
+def _warm_up() -> None:
+    # INIT フェーズで依存の読み込み・認証情報の解決・認証情報ストアへの接続確立を済ませる
+    try:
+        service = _get_service()
+        _get_session()
+        repository = service.token_repository
+        if isinstance(repository, DynamoDbTokenRepository):
+            repository.client.describe_endpoints()
+        elif isinstance(repository, SsmTokenRepository):
+            # パラメータを取得して Powertools のキャッシュにも載せておく
+            repository.get_credentials()
+    except Exception as e:
+        logger.warning("Warm-up failed: %s", e)
+
+
+def lambda_handler(event, context) -> None:
     # 通知を実行
-    service.notify()
+    _get_service().notify()
+
+
+# Provisioned Concurrency の場合のみ、初回呼び出し前に初期化を済ませる
+if os.getenv("AWS_LAMBDA_INITIALIZATION_TYPE") == "provisioned-concurrency":
+    _warm_up()
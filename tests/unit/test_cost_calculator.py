@@ -0,0 +1,86 @@
+"""Unit tests for AwsCostCalculator billing retrieval."""
+import pytest
+from unittest.mock import Mock
+from botocore.exceptions import ClientError
+from freezegun import freeze_time
+import lambda_function
+from lambda_function import AwsCostCalculator, BillingInfo
+
+
+def _cost_response(amount):
+    return {
+        'ResultsByTime': [{
+            'TimePeriod': {'Start': '2025-11-01', 'End': '2025-11-22'},
+            'Total': {'UnblendedCost': {'Amount': amount, 'Unit': 'USD'}}
+        }]
+    }
+
+
+@pytest.fixture
+def mock_client(mocker):
+    client = Mock()
+    mocker.patch.object(lambda_function, '_get_client', return_value=client)
+    mocker.patch.object(lambda_function, 'COST_METRICS_VALUE', 'UnblendedCost')
+    mocker.patch.object(lambda_function, '_LAST_BILLING', None)
+    return client
+
+
+@pytest.mark.unit
+class TestAwsCostCalculator:
+    """Tests for AwsCostCalculator Cost Explorer access."""
+
+    @freeze_time("2025-11-22")
+    def test_get_billing_info(self, mock_client):
+        """Test Cost Explorer response is converted to BillingInfo."""
+        mock_client.get_cost_and_usage.return_value = _cost_response('123.456')
+        calculator = AwsCostCalculator()
+
+        result = calculator.get_billing_info()
+
+        assert result == BillingInfo(
+            start='2025-11-01',
+            end='2025-11-22',
+            amount=123.456
+        )
+        mock_client.get_cost_and_usage.assert_called_once_with(
+            TimePeriod={'Start': '2025-11-01', 'End': '2025-11-22'},
+            Granularity='MONTHLY',
+            Metrics=['UnblendedCost']
+        )
+
+    @freeze_time("2025-11-22")
+    def test_get_billing_info_is_cached_within_ttl(self, mock_client):
+        """Test warm invocations for the same period reuse the cached result."""
+        mock_client.get_cost_and_usage.return_value = _cost_response('123.456')
+        calculator = AwsCostCalculator()
+
+        first = calculator.get_billing_info()
+        second = calculator.get_billing_info()
+
+        assert first == second
+        mock_client.get_cost_and_usage.assert_called_once()
+
+    def test_get_billing_info_refetches_for_new_period(self, mock_client):
+        """Test a new date range bypasses the cache."""
+        mock_client.get_cost_and_usage.return_value = _cost_response('123.456')
+        calculator = AwsCostCalculator()
+
+        with freeze_time("2025-11-22"):
+            calculator.get_billing_info()
+        with freeze_time("2025-11-23"):
+            calculator.get_billing_info()
+
+        assert mock_client.get_cost_and_usage.call_count == 2
+        assert lambda_function._LAST_BILLING[0] == (
+            '2025-11-01', '2025-11-23', 'UnblendedCost'
+        )
+
+    def test_get_billing_info_returns_none_on_client_error(self, mock_client):
+        """Test AWS API errors yield None."""
+        mock_client.get_cost_and_usage.side_effect = ClientError(
+            {'Error': {'Code': 'LimitExceededException', 'Message': 'throttled'}},
+            'GetCostAndUsage'
+        )
+        calculator = AwsCostCalculator()
+
+        assert calculator.get_billing_info() is None
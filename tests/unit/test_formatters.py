@@ -1,5 +1,6 @@
 """Unit tests for BillingMessageFormatter logic."""
 import pytest
+import lambda_function
 from lambda_function import BillingMessageFormatter, BillingInfo
 
 
@@ -66,3 +67,18 @@ class TestBillingMessageFormatter:
         
         result = formatter.format(billing_info)
         assert result == ""
+
+    def test_format_nonexistent_date_logs_error(self, mocker):
+        """Test ValueError from date parsing is logged and returns empty."""
+        mock_logger = mocker.patch.object(lambda_function, 'logger')
+        formatter = BillingMessageFormatter()
+        billing_info = BillingInfo(
+            start='2025-02-30',
+            end='2025-03-01',
+            amount=100.0
+        )
+        
+        result = formatter.format(billing_info)
+        assert result == ""
+        mock_logger.error.assert_called_once()
+        mock_logger.exception.assert_not_called()
@@ -0,0 +1,105 @@
+"""Unit tests for LineNotifier request building."""
+import pytest
+from unittest.mock import Mock
+import requests
+import lambda_function
+from lambda_function import LineNotifier, LineCredentials
+
+
+@pytest.mark.unit
+class TestLineNotifier:
+    """Tests for LineNotifier HTTP request construction."""
+
+    def test_headers_are_built_on_init(self):
+        """Test auth headers are prepared once in the constructor."""
+        notifier = LineNotifier(
+            LineCredentials(channel_id='test_channel', access_token='test_token'),
+            api_url='https://example.com/push'
+        )
+
+        assert notifier._headers == {
+            "Authorization": "Bearer test_token",
+            "Content-Type": "application/json"
+        }
+
+    def test_send_posts_prebuilt_headers(self, mocker):
+        """Test send uses the prepared headers and encodes the payload."""
+        response = Mock(status_code=200)
+        mock_session = Mock()
+        mock_session.post.return_value = response
+        mocker.patch.object(
+            lambda_function, '_get_session', return_value=mock_session
+        )
+        mock_post = mock_session.post
+        notifier = LineNotifier(
+            LineCredentials(channel_id='test_channel', access_token='test_token'),
+            api_url='https://example.com/push'
+        )
+
+        result = notifier.send('テストメッセージ')
+
+        assert result is True
+        mock_post.assert_called_once()
+        _, kwargs = mock_post.call_args
+        assert kwargs['headers']['Authorization'] == 'Bearer test_token'
+        assert kwargs['headers']['Content-Type'] == 'application/json'
+        assert kwargs['headers']['X-Line-Retry-Key']
+        assert kwargs['data'] == (
+            '{"to":"test_channel",'
+            '"messages":[{"type":"text","text":"テストメッセージ"}]}'
+        ).encode()
+
+    def test_send_returns_false_on_error_status(self, mocker):
+        """Test non-200 responses are reported as failures."""
+        mock_session = Mock()
+        mock_session.post.return_value = Mock(
+            status_code=400, text='{"message":"Invalid request"}'
+        )
+        mocker.patch.object(
+            lambda_function, '_get_session', return_value=mock_session
+        )
+        notifier = LineNotifier(
+            LineCredentials(channel_id='test_channel', access_token='test_token'),
+            api_url='https://example.com/push'
+        )
+
+        assert notifier.send('テストメッセージ') is False
+
+    def test_send_treats_accepted_retry_as_success(self, mocker):
+        """Test 409 for an already accepted retry key counts as delivered."""
+        mock_session = Mock()
+        mock_session.post.return_value = Mock(
+            status_code=409,
+            headers={'X-Line-Accepted-Request-Id': 'accepted-id'}
+        )
+        mocker.patch.object(
+            lambda_function, '_get_session', return_value=mock_session
+        )
+        notifier = LineNotifier(
+            LineCredentials(channel_id='test_channel', access_token='test_token'),
+            api_url='https://example.com/push'
+        )
+
+        assert notifier.send('テストメッセージ') is True
+
+    def test_session_retries_post_on_retryable_status(self):
+        """Test the pooled session retries LINE POSTs on 429/5xx."""
+        retry = lambda_function._get_session().get_adapter('https://').max_retries
+
+        assert retry.is_retry('POST', 429)
+        assert retry.is_retry('POST', 503)
+        assert not retry.is_retry('POST', 400)
+
+    def test_send_returns_false_on_request_exception(self, mocker):
+        """Test connection errors are reported as failures."""
+        mock_session = Mock()
+        mock_session.post.side_effect = requests.exceptions.ConnectionError('refused')
+        mocker.patch.object(
+            lambda_function, '_get_session', return_value=mock_session
+        )
+        notifier = LineNotifier(
+            LineCredentials(channel_id='test_channel', access_token='test_token'),
+            api_url='https://example.com/push'
+        )
+
+        assert notifier.send('テストメッセージ') is False
@@ -1,6 +1,7 @@
 """Unit tests for CostNotificationService business logic."""
 import pytest
 from unittest.mock import Mock
+import lambda_function
 from lambda_function import (
     CostNotificationService,
     BillingInfo,
@@ -73,7 +74,8 @@ class TestCostNotificationService:
         assert result is False
         mock_calculator.get_billing_info.assert_called_once()
         mock_formatter.format.assert_not_called()
-        mock_repository.get_credentials.assert_not_called()
+        # Credentials are fetched concurrently with billing info
+        mock_repository.get_credentials.assert_called_once()
 
     def test_notify_fails_when_message_is_empty(self):
         """Test failure when message is empty."""
@@ -100,7 +102,7 @@ class TestCostNotificationService:
         assert result is False
         mock_calculator.get_billing_info.assert_called_once()
         mock_formatter.format.assert_called_once()
-        mock_repository.get_credentials.assert_not_called()
+        mock_repository.get_credentials.assert_called_once()
 
     def test_notify_fails_when_credentials_is_none(self):
         """Test failure when credentials are None."""
@@ -190,3 +192,74 @@ class TestCostNotificationService:
         assert result is True
         # Verify zero amount is handled correctly
         mock_formatter.format.assert_called_once()
+
+    def test_notify_logs_single_record(self, mocker):
+        """Test one structured record is logged per successful notification."""
+        mock_logger = mocker.patch.object(lambda_function, 'logger')
+        billing_info = BillingInfo(
+            start='2025-11-01',
+            end='2025-11-22',
+            amount=123.456
+        )
+        mock_calculator = Mock(spec=CostCalculatorBase)
+        mock_calculator.get_billing_info.return_value = billing_info
+        
+        mock_repository = Mock(spec=TokenRepositoryBase)
+        mock_repository.get_credentials.return_value = LineCredentials(
+            channel_id='test_channel',
+            access_token='test_token'
+        )
+        
+        mock_formatter = Mock(spec=MessageFormatterBase)
+        mock_formatter.format.return_value = 'テストメッセージ'
+        
+        mocker.patch.object(LineNotifier, 'send', return_value=True)
+        
+        service = CostNotificationService(
+            cost_calculator=mock_calculator,
+            token_repository=mock_repository,
+            message_formatter=mock_formatter
+        )
+        
+        service.notify()
+        
+        mock_logger.info.assert_called_once_with("notify", extra={
+            'billing_info': billing_info._asdict(),
+            'notification_message': 'テストメッセージ',
+            'notification_success': True
+        })
+        mock_logger.error.assert_not_called()
+
+    def test_notify_logs_error_record_when_send_fails(self, mocker):
+        """Test the final record is logged at ERROR when sending fails."""
+        mock_logger = mocker.patch.object(lambda_function, 'logger')
+        mock_calculator = Mock(spec=CostCalculatorBase)
+        mock_calculator.get_billing_info.return_value = BillingInfo(
+            start='2025-11-01',
+            end='2025-11-22',
+            amount=123.456
+        )
+        
+        mock_repository = Mock(spec=TokenRepositoryBase)
+        mock_repository.get_credentials.return_value = LineCredentials(
+            channel_id='test_channel',
+            access_token='test_token'
+        )
+        
+        mock_formatter = Mock(spec=MessageFormatterBase)
+        mock_formatter.format.return_value = 'テストメッセージ'
+        
+        mocker.patch.object(LineNotifier, 'send', return_value=False)
+        
+        service = CostNotificationService(
+            cost_calculator=mock_calculator,
+            token_repository=mock_repository,
+            message_formatter=mock_formatter
+        )
+        
+        service.notify()
+        
+        mock_logger.info.assert_not_called()
+        mock_logger.error.assert_called_once()
+        _, kwargs = mock_logger.error.call_args
+        assert kwargs['extra']['notification_success'] is False
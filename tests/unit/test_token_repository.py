@@ -0,0 +1,188 @@
+"""Unit tests for token repository credential loading."""
+import pytest
+from unittest.mock import Mock
+from botocore.exceptions import ClientError
+import lambda_function
+from aws_lambda_powertools.utilities import parameters
+from lambda_function import (
+    DynamoDbTokenRepository,
+    SsmTokenRepository,
+    LineCredentials
+)
+
+
+def _batch_response(table_name):
+    return {
+        'Responses': {
+            table_name: [
+                {'type': {'S': 'line_channel_id'}, 'value': {'S': 'test_channel'}},
+                {'type': {'S': 'line_access_token'}, 'value': {'S': 'test_token'}},
+            ]
+        },
+        'UnprocessedKeys': {}
+    }
+
+
+@pytest.fixture
+def mock_client(mocker):
+    client = Mock()
+    mocker.patch.object(lambda_function, '_get_client', return_value=client)
+    mocker.patch.dict(lambda_function._CREDENTIALS_CACHE, clear=True)
+    return client
+
+
+@pytest.mark.unit
+class TestDynamoDbTokenRepository:
+    """Tests for DynamoDbTokenRepository credential retrieval."""
+
+    def test_get_credentials_uses_single_batch_call(self, mock_client):
+        """Test both credential items are fetched in one BatchGetItem."""
+        mock_client.batch_get_item.return_value = _batch_response('settings')
+        repository = DynamoDbTokenRepository('settings')
+
+        result = repository.get_credentials()
+
+        assert result == LineCredentials(
+            channel_id='test_channel',
+            access_token='test_token'
+        )
+        mock_client.batch_get_item.assert_called_once()
+
+    def test_get_credentials_retries_unprocessed_keys(self, mock_client, mocker):
+        """Test UnprocessedKeys are fetched again after a short wait."""
+        unprocessed = {
+            'settings': {'Keys': [{'type': {'S': 'line_access_token'}}]}
+        }
+        mock_client.batch_get_item.side_effect = [
+            {
+                'Responses': {'settings': [
+                    {'type': {'S': 'line_channel_id'}, 'value': {'S': 'test_channel'}}
+                ]},
+                'UnprocessedKeys': unprocessed
+            },
+            {
+                'Responses': {'settings': [
+                    {'type': {'S': 'line_access_token'}, 'value': {'S': 'test_token'}}
+                ]},
+                'UnprocessedKeys': {}
+            },
+        ]
+        mock_sleep = mocker.patch.object(lambda_function.time, 'sleep')
+        repository = DynamoDbTokenRepository('settings')
+
+        result = repository.get_credentials()
+
+        assert result == LineCredentials(
+            channel_id='test_channel',
+            access_token='test_token'
+        )
+        assert mock_client.batch_get_item.call_count == 2
+        mock_client.batch_get_item.assert_called_with(RequestItems=unprocessed)
+        mock_sleep.assert_called_once_with(lambda_function.UNPROCESSED_KEYS_RETRY_DELAY)
+
+    def test_get_credentials_returns_none_when_value_missing(self, mock_client):
+        """Test an item without value.S yields None."""
+        mock_client.batch_get_item.return_value = {
+            'Responses': {'settings': [
+                {'type': {'S': 'line_channel_id'}},
+                {'type': {'S': 'line_access_token'}, 'value': {'S': 'test_token'}},
+            ]},
+            'UnprocessedKeys': {}
+        }
+        repository = DynamoDbTokenRepository('settings')
+
+        assert repository.get_credentials() is None
+        assert 'settings' not in lambda_function._CREDENTIALS_CACHE
+
+    def test_get_credentials_is_cached_within_ttl(self, mock_client):
+        """Test warm invocations reuse cached credentials."""
+        mock_client.batch_get_item.return_value = _batch_response('settings')
+        repository = DynamoDbTokenRepository('settings')
+
+        first = repository.get_credentials()
+        second = repository.get_credentials()
+
+        assert first == second
+        mock_client.batch_get_item.assert_called_once()
+
+    def test_get_credentials_refreshes_after_ttl(self, mock_client, mocker):
+        """Test credentials are fetched again once the TTL has elapsed."""
+        mock_client.batch_get_item.return_value = _batch_response('settings')
+        repository = DynamoDbTokenRepository('settings')
+        mock_time = mocker.patch.object(lambda_function.time, 'monotonic')
+
+        mock_time.return_value = 0.0
+        repository.get_credentials()
+        mock_time.return_value = lambda_function.CREDENTIALS_CACHE_TTL + 1.0
+        repository.get_credentials()
+
+        assert mock_client.batch_get_item.call_count == 2
+
+    def test_get_credentials_returns_none_when_item_missing(self, mock_client):
+        """Test missing items yield None and are not cached."""
+        mock_client.batch_get_item.return_value = {
+            'Responses': {'settings': []},
+            'UnprocessedKeys': {}
+        }
+        repository = DynamoDbTokenRepository('settings')
+
+        assert repository.get_credentials() is None
+        assert 'settings' not in lambda_function._CREDENTIALS_CACHE
+
+
+@pytest.mark.unit
+class TestSsmTokenRepository:
+    """Tests for SsmTokenRepository credential retrieval."""
+
+    def test_provider_uses_shared_client(self, mock_client):
+        """Test Parameter Store uses the configured ssm client."""
+        repository = SsmTokenRepository('/line/channel_id', '/line/access_token')
+
+        lambda_function._get_client.assert_called_once_with('ssm')
+        assert repository.provider.client is mock_client
+
+    def test_get_credentials_fetches_parameters_by_name(self, mock_client, mocker):
+        """Test both parameters are fetched in one cached call."""
+        mock_get = mocker.patch.object(
+            parameters.SSMProvider, 'get_parameters_by_name',
+            return_value={
+                '/line/channel_id': 'test_channel',
+                '/line/access_token': 'test_token'
+            }
+        )
+        repository = SsmTokenRepository('/line/channel_id', '/line/access_token')
+
+        result = repository.get_credentials()
+
+        assert result == LineCredentials(
+            channel_id='test_channel',
+            access_token='test_token'
+        )
+        mock_get.assert_called_once_with(
+            parameters={'/line/channel_id': {}, '/line/access_token': {}},
+            decrypt=True,
+            max_age=900
+        )
+
+    def test_get_credentials_returns_none_on_error(self, mock_client, mocker):
+        """Test parameter retrieval errors yield None."""
+        mocker.patch.object(
+            parameters.SSMProvider, 'get_parameters_by_name',
+            side_effect=parameters.GetParameterError('not found')
+        )
+        repository = SsmTokenRepository('/line/channel_id', '/line/access_token')
+
+        assert repository.get_credentials() is None
+
+    def test_get_credentials_returns_none_on_client_error(self, mock_client, mocker):
+        """Test AWS API errors from Parameter Store yield None."""
+        mocker.patch.object(
+            parameters.SSMProvider, 'get_parameters_by_name',
+            side_effect=ClientError(
+                {'Error': {'Code': 'AccessDeniedException', 'Message': 'denied'}},
+                'GetParameters'
+            )
+        )
+        repository = SsmTokenRepository('/line/channel_id', '/line/access_token')
+
+        assert repository.get_credentials() is None
@@ -0,0 +1,47 @@
+"""Unit tests for provisioned concurrency warm-up."""
+import pytest
+from unittest.mock import Mock
+import lambda_function
+from lambda_function import DynamoDbTokenRepository, SsmTokenRepository
+
+
+@pytest.mark.unit
+class TestWarmUp:
+    """Tests for _warm_up initialization."""
+
+    def test_warm_up_primes_dynamodb_connection(self, mocker):
+        """Test warm-up builds the service and touches DynamoDB."""
+        repository = Mock(spec=DynamoDbTokenRepository)
+        repository.client = Mock()
+        mocker.patch.object(
+            lambda_function, '_get_service',
+            return_value=Mock(token_repository=repository)
+        )
+        mock_session = mocker.patch.object(lambda_function, '_get_session')
+
+        lambda_function._warm_up()
+
+        mock_session.assert_called_once()
+        repository.client.describe_endpoints.assert_called_once()
+
+    def test_warm_up_primes_parameter_store(self, mocker):
+        """Test warm-up fetches credentials into the Parameter Store cache."""
+        repository = Mock(spec=SsmTokenRepository)
+        mocker.patch.object(
+            lambda_function, '_get_service',
+            return_value=Mock(token_repository=repository)
+        )
+        mocker.patch.object(lambda_function, '_get_session')
+
+        lambda_function._warm_up()
+
+        repository.get_credentials.assert_called_once()
+
+    def test_warm_up_swallows_errors(self, mocker):
+        """Test warm-up failures do not break initialization."""
+        mocker.patch.object(
+            lambda_function, '_get_service',
+            side_effect=RuntimeError('no credentials')
+        )
+
+        lambda_function._warm_up()